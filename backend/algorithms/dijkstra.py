@@ -1,34 +1,98 @@
 
-import heapq
+import threading
+import numpy as np
+from cachetools import LRUCache
+from algorithms.dijkstra_numba import dijkstra_csr
 
-def calculate_dijkstra(graph, start_node, end_node):
+class _CSRGraph:
+    """CSR form of a dict graph plus the scratch arrays reused by every route on it."""
+    __slots__ = (
+        "graph", "nodes", "node_index", "indptr", "indices", "weights",
+        "dist", "prev", "heap_dist", "heap_node"
+    )
+
+# id(graph) -> _CSRGraph for the most recently routed graphs. Each entry holds its graph
+# so the id cannot be reused while cached; the LRU bound caps what is kept alive.
+CSR_CACHE_SIZE = 32
+_CSR_CACHE = LRUCache(maxsize=CSR_CACHE_SIZE)
+_CSR_LOCK = threading.Lock()
+
+def _build_csr(graph):
+    nodes = list(graph)
+    node_index = {node: i for i, node in enumerate(nodes)}
+    for neighbors in graph.values():
+        for neighbor in neighbors:
+            if neighbor not in node_index:
+                node_index[neighbor] = len(nodes)
+                nodes.append(neighbor)
+
+    indptr = np.zeros(len(nodes) + 1, dtype=np.int32)
+    indices = []
+    weights = []
+    for i, node in enumerate(nodes):
+        neighbors = graph.get(node, {})
+        for neighbor, weight in neighbors.items():
+            # Dijkstra needs non-negative weights; the kernel's heap is sized on that assumption
+            if not weight >= 0:
+                raise ValueError(f"Edge {node!r} -> {neighbor!r} has invalid weight {weight!r}")
+            indices.append(node_index[neighbor])
+            weights.append(weight)
+        indptr[i + 1] = len(indices)
+
+    csr = _CSRGraph()
+    csr.graph = graph
+    csr.nodes = nodes
+    csr.node_index = node_index
+    csr.indptr = indptr
+    csr.indices = np.asarray(indices, dtype=np.int32)
+    csr.weights = np.asarray(weights, dtype=np.float64)
+    csr.dist = np.full(len(nodes), np.inf)
+    csr.prev = np.full(len(nodes), -1, dtype=np.int32)
+    csr.heap_dist = np.empty(len(indices) + 1, dtype=np.float64)
+    csr.heap_node = np.empty(len(indices) + 1, dtype=np.int32)
+    return csr
+
+def _get_csr(graph, rebuild=False):
+    key = id(graph)
+    with _CSR_LOCK:
+        csr = _CSR_CACHE.get(key)
+        if csr is not None and csr.graph is graph and not rebuild:
+            return csr
+
+    csr = _build_csr(graph)
+    with _CSR_LOCK:
+        _CSR_CACHE[key] = csr
+    return csr
+
+def invalidate_graph(graph=None):
+    """
+    Drop the cached CSR for `graph` (or every cached graph when None).
+    Call this after mutating a graph that has already been routed on.
+    """
+    with _CSR_LOCK:
+        if graph is None:
+            _CSR_CACHE.clear()
+        else:
+            csr = _CSR_CACHE.get(id(graph))
+            if csr is not None and csr.graph is graph:
+                del _CSR_CACHE[id(graph)]
+
+def calculate_dijkstra(graph, start_node, end_node, rebuild=False):
     """
     Standard Dijkstra's implementation for routing between medical facilities.
     graph: dict of {node: {neighbor: weight}}
+    The graph is converted to CSR once and memoized by identity. After mutating it,
+    pass rebuild=True or call invalidate_graph(graph), otherwise routes are stale.
     """
-    distances = {node: float('infinity') for node in graph}
-    distances[start_node] = 0
-    pq = [(0, start_node)]
-    previous_nodes = {node: None for node in graph}
-
-    while pq:
-        current_distance, current_node = heapq.heappop(pq)
-
-        if current_node == end_node:
-            path = []
-            while current_node is not None:
-                path.append(current_node)
-                current_node = previous_nodes[current_node]
-            return path[::-1], distances[end_node]
-
-        if current_distance > distances[current_node]:
-            continue
-
-        for neighbor, weight in graph[current_node].items():
-            distance = current_distance + weight
-            if distance < distances[neighbor]:
-                distances[neighbor] = distance
-                previous_nodes[neighbor] = current_node
-                heapq.heappush(pq, (distance, neighbor))
-
-    return None, float('infinity')
+    csr = _get_csr(graph, rebuild)
+    if start_node not in csr.node_index or end_node not in csr.node_index:
+        return None, float('infinity')
+
+    path, distance = dijkstra_csr(
+        csr.indptr, csr.indices, csr.weights,
+        np.int32(csr.node_index[start_node]), np.int32(csr.node_index[end_node]),
+        csr.dist, csr.prev, csr.heap_dist, csr.heap_node
+    )
+    if len(path) == 0:
+        return None, float('infinity')
+    return [csr.nodes[i] for i in path], float(distance)
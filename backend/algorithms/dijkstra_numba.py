@@ -0,0 +1,105 @@
+
+import numpy as np
+from numba import njit
+
+
+# 4-ary heap (children of i at 4i+1..4i+4): shallower than binary, so fewer
+# sifts on the push-heavy workload of road-network Dijkstra
+
+@njit(cache=True)
+def _heap_push(heap_dist, heap_node, size, dist, node):
+    # Sift the new entry up from the end of the heap
+    i = size
+    while i > 0:
+        parent = (i - 1) // 4
+        if heap_dist[parent] <= dist:
+            break
+        heap_dist[i] = heap_dist[parent]
+        heap_node[i] = heap_node[parent]
+        i = parent
+    heap_dist[i] = dist
+    heap_node[i] = node
+    return size + 1
+
+
+@njit(cache=True)
+def _heap_pop(heap_dist, heap_node, size):
+    # Take the root, then sift the last entry down into its place
+    top_dist = heap_dist[0]
+    top_node = heap_node[0]
+    size -= 1
+    last_dist = heap_dist[size]
+    last_node = heap_node[size]
+    i = 0
+    while True:
+        first = 4 * i + 1
+        if first >= size:
+            break
+        # Pick the smallest of up to four children
+        child = first
+        for c in range(first + 1, min(first + 4, size)):
+            if heap_dist[c] < heap_dist[child]:
+                child = c
+        if last_dist <= heap_dist[child]:
+            break
+        heap_dist[i] = heap_dist[child]
+        heap_node[i] = heap_node[child]
+        i = child
+    heap_dist[i] = last_dist
+    heap_node[i] = last_node
+    return top_dist, top_node, size
+
+
+# Explicit signature compiles eagerly at import (and caches to __pycache__),
+# so the first routing request doesn't pay JIT latency.
+@njit(
+    'Tuple((int32[:], float64))'
+    '(int32[:], int32[:], float64[:], int32, int32, float64[:], int32[:], float64[:], int32[:])',
+    cache=True
+)
+def dijkstra_csr(indptr, indices, weights, start, end, dist, prev, heap_dist, heap_node):
+    """
+    Dijkstra over a graph in CSR form, compiled with Numba.
+    indptr/indices/weights: neighbors of node i are indices[indptr[i]:indptr[i+1]]
+    dist/prev (one slot per node) and heap_dist/heap_node (edges + 1 slots) are
+    caller-owned scratch arrays, reset here so they can be reused across calls.
+    Returns (path, distance); path is empty and distance is inf when unreachable.
+    """
+    dist[:] = np.inf
+    prev[:] = -1
+
+    dist[start] = 0.0
+    size = _heap_push(heap_dist, heap_node, 0, 0.0, start)
+
+    while size > 0:
+        current_distance, current_node, size = _heap_pop(heap_dist, heap_node, size)
+
+        if current_node == end:
+            break
+
+        if current_distance > dist[current_node]:
+            continue
+
+        for k in range(indptr[current_node], indptr[current_node + 1]):
+            neighbor = indices[k]
+            distance = current_distance + weights[k]
+            if distance < dist[neighbor]:
+                dist[neighbor] = distance
+                prev[neighbor] = current_node
+                size = _heap_push(heap_dist, heap_node, size, distance, neighbor)
+
+    if dist[end] == np.inf:
+        return np.empty(0, dtype=np.int32), np.inf
+
+    length = 1
+    node = end
+    while prev[node] != -1:
+        node = prev[node]
+        length += 1
+
+    path = np.empty(length, dtype=np.int32)
+    node = end
+    for i in range(length - 1, -1, -1):
+        path[i] = node
+        node = prev[node]
+    return path, dist[end]
@@ -1,50 +1,177 @@
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.models.user import User, UserRole
 from app.schemas.request import UserLogin, UserCreate
 import jose.jwt as jwt
-from datetime import datetime, timedelta
+from jose import JWTError
+from cachetools import TTLCache
+from datetime import timedelta
+import bcrypt
+import hashlib
+import hmac
+import secrets
+import threading
+import time
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 SECRET_KEY = "lifelink-super-secret-key"
 ALGORITHM = "HS256"
 
+# Decoded token payloads keyed by a hash of the token (raw tokens are never stored).
+# Entries live at most 60s and are never served past the token's own `exp`.
+_VERIFY_CACHE = TTLCache(maxsize=10_000, ttl=60)
+_VERIFY_LOCK = threading.Lock()
+
+# Tokens revoked by /logout, keyed like the verify cache -> the token's own `exp`.
+# A plain dict, not a bounded cache: a deny-list must never evict a live entry, so
+# entries are only dropped once their token has expired anyway.
+# This lives in process memory, so revocation is per worker and lost on restart.
+_REVOKED: dict[str, float] = {}
+_REVOKED_PRUNE_INTERVAL = 60
+_revoked_pruned_at = 0.0
+
+ACCESS_TOKEN_EXPIRE = timedelta(hours=24)
+
+_BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+# bcrypt only reads the first 72 bytes; bcrypt>=5 raises instead of truncating
+_BCRYPT_MAX_BYTES = 72
+
+# Recently verified passwords so repeat logins skip the bcrypt KDF.
+# Keyed by user id + stored hash (a password change invalidates the entry),
+# value is a keyed blake2b digest of the password, never the password itself.
+_PASSWORD_CACHE = TTLCache(maxsize=10_000, ttl=300)
+_PASSWORD_LOCK = threading.Lock()
+
+# Checked against when the email is unknown, so that case costs the same bcrypt
+# work as a wrong password and response time doesn't reveal which emails exist
+_DUMMY_HASH = bcrypt.hashpw(secrets.token_bytes(16), bcrypt.gensalt()).decode()
+
+bearer_scheme = HTTPBearer()
+
+def _token_key(token: str) -> str:
+    return hashlib.blake2b(token.encode(), digest_size=16).hexdigest()
+
+def verify_token(token: str) -> dict:
+    key = _token_key(token)
+    with _VERIFY_LOCK:
+        if key in _REVOKED:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has been revoked")
+        payload = _VERIFY_CACHE.get(key)
+    if payload is not None and payload.get("exp", 0) > time.time():
+        return payload
+
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        with _VERIFY_LOCK:
+            _VERIFY_CACHE.pop(key, None)
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token")
+
+    with _VERIFY_LOCK:
+        _VERIFY_CACHE[key] = payload
+    return payload
+
+def revoke_token(token: str, exp: float) -> None:
+    global _revoked_pruned_at
+    key = _token_key(token)
+    now = time.time()
+    with _VERIFY_LOCK:
+        _VERIFY_CACHE.pop(key, None)
+        _REVOKED[key] = exp
+        if now - _revoked_pruned_at >= _REVOKED_PRUNE_INTERVAL:
+            for expired in [k for k, k_exp in _REVOKED.items() if k_exp <= now]:
+                del _REVOKED[expired]
+            _revoked_pruned_at = now
+
+def _hash_password(password: str) -> str:
+    return bcrypt.hashpw(password.encode()[:_BCRYPT_MAX_BYTES], bcrypt.gensalt()).decode()
+
+def _check_password(password: str, hashed_password: str) -> bool:
+    try:
+        return bcrypt.checkpw(password.encode()[:_BCRYPT_MAX_BYTES], hashed_password.encode())
+    except ValueError:
+        # Malformed stored hash: treat as a failed login rather than a 500
+        return False
+
+def _password_digest(password: str) -> bytes:
+    return hashlib.blake2b(password.encode(), key=SECRET_KEY.encode(), digest_size=32).digest()
+
+async def _verify_password(user: User, password: str, db: AsyncSession) -> bool:
+    cache_key = f"{user.id}:{user.hashed_password}"
+    digest = _password_digest(password)
+    with _PASSWORD_LOCK:
+        cached = _PASSWORD_CACHE.get(cache_key)
+    if cached is not None and hmac.compare_digest(cached, digest):
+        return True
+
+    if not user.hashed_password.startswith(_BCRYPT_PREFIXES):
+        # Legacy plaintext row: compare in constant time, then upgrade to bcrypt
+        if not hmac.compare_digest(user.hashed_password.encode(), password.encode()):
+            return False
+        user.hashed_password = await run_in_threadpool(_hash_password, password)
+        await db.commit()
+        cache_key = f"{user.id}:{user.hashed_password}"
+    elif not await run_in_threadpool(_check_password, password, user.hashed_password):
+        return False
+
+    with _PASSWORD_LOCK:
+        _PASSWORD_CACHE[cache_key] = digest
+    return True
+
+def _issue_token(user: User) -> str:
+    # Every login gets its own token, so logging out one device leaves the others alone
+    token_data = {
+        "sub": str(user.id),
+        "role": user.role,
+        "exp": int(time.time() + ACCESS_TOKEN_EXPIRE.total_seconds()),
+        # Unique id so two logins in the same second never share a token
+        "jti": secrets.token_hex(16)
+    }
+    return jwt.encode(token_data, SECRET_KEY, algorithm=ALGORITHM)
+
 @router.post("/register")
-async def register(user_in: UserCreate, db: Session = Depends(get_db)):
-    db_user = db.query(User).filter(User.email == user_in.email).first()
+async def register(user_in: UserCreate, db: AsyncSession = Depends(get_db)):
+    db_user = await db.scalar(select(User).where(User.email == user_in.email))
     if db_user:
         raise HTTPException(status_code=400, detail="Email already registered")
     
     new_user = User(
         email=user_in.email,
-        hashed_password=user_in.password, # In production, use pwd_context.hash()
+        hashed_password=await run_in_threadpool(_hash_password, user_in.password),
         full_name=user_in.full_name,
         role=user_in.role
     )
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
     return {"msg": "User created", "role": new_user.role}
 
 @router.post("/login")
-async def login(user_in: UserLogin, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == user_in.email).first()
-    if not user or user.hashed_password != user_in.password:
+async def login(user_in: UserLogin, db: AsyncSession = Depends(get_db)):
+    user = await db.scalar(select(User).where(User.email == user_in.email))
+    if not user:
+        await run_in_threadpool(_check_password, user_in.password, _DUMMY_HASH)
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    if not await _verify_password(user, user_in.password, db):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
-    token_data = {
-        "sub": str(user.id),
-        "role": user.role,
-        "exp": datetime.utcnow() + timedelta(hours=24)
-    }
-    token = jwt.encode(token_data, SECRET_KEY, algorithm=ALGORITHM)
-    
+    token = _issue_token(user)
+
     return {
         "access_token": token,
         "token_type": "bearer",
         "role": user.role,
         "full_name": user.full_name
     }
+
+@router.post("/logout")
+async def logout(credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme)):
+    payload = verify_token(credentials.credentials)
+    revoke_token(credentials.credentials, payload["exp"])
+    return {"msg": "Logged out"}
@@ -1,5 +1,8 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from typing import List
+import hashlib
+import numpy as np
+import orjson
 from app.schemas.insights import InsightResponse, BloodCompatibilityRequest, BloodCompatibilityResponse, FirstAidGuide
 
 router = APIRouter(
@@ -7,87 +10,129 @@ router = APIRouter(
     tags=["insights"]
 )
 
-@router.get("/iron-absorption", response_model=InsightResponse)
-def get_iron_absorption_tips():
-    return {
-        "title": "Tips for Improving Iron Absorption",
-        "content": [
-            "Consume Vitamin C rich foods (citrus fruits, bell peppers) with iron-rich meals.",
-            "Avoid drinking tea or coffee with meals as tannins can inhibit iron absorption.",
-            "Cook in cast iron skillets to increase iron content in food.",
-            "Include lean meats, poultry, and fish in your diet as they contain heme iron which is easily absorbed.",
-            "Soak beans and grains before cooking to reduce phytates which can block iron absorption."
-        ],
-        "source": "General Health Guidelines"
+_IRON_ABSORPTION_TIPS = {
+    "title": "Tips for Improving Iron Absorption",
+    "content": [
+        "Consume Vitamin C rich foods (citrus fruits, bell peppers) with iron-rich meals.",
+        "Avoid drinking tea or coffee with meals as tannins can inhibit iron absorption.",
+        "Cook in cast iron skillets to increase iron content in food.",
+        "Include lean meats, poultry, and fish in your diet as they contain heme iron which is easily absorbed.",
+        "Soak beans and grains before cooking to reduce phytates which can block iron absorption."
+    ],
+    "source": "General Health Guidelines"
+}
+
+_DONOR_RECOVERY_TIPS = {
+    "title": "Post-Donation Recovery Advice",
+    "content": [
+        "Drink plenty of fluids for the next 24-48 hours.",
+        "Avoid strenuous physical activity or heavy lifting for the rest of the day.",
+        "Keep the bandage on for the next 5 hours.",
+        "If you feel lightheaded, lie down with your feet up until the feeling passes.",
+        "Eat a healthy meal rich in iron and protein."
+    ],
+    "source": "Blood Donation Center Protocols"
+}
+
+# blood type -> (can give to, can receive from)
+_COMPAT: dict[str, tuple[tuple[str, ...], tuple[str, ...]]] = {
+    "O-": (("O-", "O+", "A-", "A+", "B-", "B+", "AB-", "AB+"), ("O-",)),
+    "O+": (("O+", "A+", "B+", "AB+"), ("O+", "O-")),
+    "A-": (("A-", "A+", "AB-", "AB+"), ("A-", "O-")),
+    "A+": (("A+", "AB+"), ("A+", "A-", "O+", "O-")),
+    "B-": (("B-", "B+", "AB-", "AB+"), ("B-", "O-")),
+    "B+": (("B+", "AB+"), ("B+", "B-", "O+", "O-")),
+    "AB-": (("AB-", "AB+"), ("AB-", "A-", "B-", "O-")),
+    "AB+": (("AB+",), ("O-", "O+", "A-", "A+", "B-", "B+", "AB-", "AB+"))
+}
+
+# Bitmask form of the chart: bit i of _GIVE[t] / _RECV[t] is set when type t can
+# give to / receive from _TYPES[i]. Batch checks become a single vectorized AND,
+# e.g. np.bitwise_and(_GIVE[donor_idx], 1 << _IDX[recipient]).astype(bool)
+_TYPES = ("O-", "O+", "A-", "A+", "B-", "B+", "AB-", "AB+")
+_IDX = {t: i for i, t in enumerate(_TYPES)}
+
+def _mask(types) -> int:
+    return sum(1 << _IDX[t] for t in types)
+
+_GIVE = np.array([_mask(_COMPAT[t][0]) for t in _TYPES], dtype=np.uint8)
+_RECV = np.array([_mask(_COMPAT[t][1]) for t in _TYPES], dtype=np.uint8)
+
+_FIRST_AID_GUIDES = [
+    {
+        "condition": "Fainting",
+        "steps": [
+            "Lie the person down on their back.",
+            "Elevate their legs to restore blood flow to the brain.",
+            "Loosen tight clothing.",
+            "Check for breathing and pulse.",
+            "If they don't wake up within a minute, call emergency services."
+        ]
+    },
+    {
+        "condition": "Bleeding",
+        "steps": [
+            "Apply direct pressure to the wound with a clean cloth.",
+            "Keep the injured limb elevated if possible.",
+            "Do not remove the cloth if it soaks through, add more layers.",
+            "Seek medical attention if bleeding is severe or doesn't stop."
+        ]
+    },
+    {
+        "condition": "Burn",
+        "steps": [
+            "Cool the burn with cool (not cold) running water for 10-20 minutes.",
+            "Cover with a sterile, non-fluffy dressing or cling film.",
+            "Do not apply ice, butter, or creams immediately.",
+            "Seek medical help for severe burns or chemical burns."
+        ]
     }
+]
+
+# Static payloads are validated and serialized once; the endpoints just hand back the bytes
+_IRON_BYTES = orjson.dumps(InsightResponse(**_IRON_ABSORPTION_TIPS).model_dump())
+_RECOVERY_BYTES = orjson.dumps(InsightResponse(**_DONOR_RECOVERY_TIPS).model_dump())
+_FIRST_AID_BYTES = orjson.dumps([FirstAidGuide(**guide).model_dump() for guide in _FIRST_AID_GUIDES])
+
+_IRON_ETAG = f'"{hashlib.md5(_IRON_BYTES).hexdigest()}"'
+_RECOVERY_ETAG = f'"{hashlib.md5(_RECOVERY_BYTES).hexdigest()}"'
+_FIRST_AID_ETAG = f'"{hashlib.md5(_FIRST_AID_BYTES).hexdigest()}"'
+
+_CACHE_CONTROL = "public, max-age=3600, immutable"
+
+def _static_response(request: Request, content: bytes, etag: str) -> Response:
+    headers = {"ETag": etag, "Cache-Control": _CACHE_CONTROL}
+    if_none_match = request.headers.get("if-none-match", "")
+    client_tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if etag in client_tags or "*" in client_tags:
+        return Response(status_code=304, headers=headers)
+    return Response(content=content, media_type="application/json", headers=headers)
+
+@router.get("/iron-absorption", response_model=InsightResponse)
+def get_iron_absorption_tips(request: Request):
+    return _static_response(request, _IRON_BYTES, _IRON_ETAG)
 
 @router.get("/donor-recovery", response_model=InsightResponse)
-def get_donor_recovery_tips():
-    return {
-        "title": "Post-Donation Recovery Advice",
-        "content": [
-            "Drink plenty of fluids for the next 24-48 hours.",
-            "Avoid strenuous physical activity or heavy lifting for the rest of the day.",
-            "Keep the bandage on for the next 5 hours.",
-            "If you feel lightheaded, lie down with your feet up until the feeling passes.",
-            "Eat a healthy meal rich in iron and protein."
-        ],
-        "source": "Blood Donation Center Protocols"
-    }
+def get_donor_recovery_tips(request: Request):
+    return _static_response(request, _RECOVERY_BYTES, _RECOVERY_ETAG)
 
 @router.post("/compatibility", response_model=BloodCompatibilityResponse)
 def check_blood_compatibility(request: BloodCompatibilityRequest):
     blood_type = request.blood_type.upper().replace(" ", "")
-    
-    compatibility_chart = {
-        "O-": {"give": ["O-", "O+", "A-", "A+", "B-", "B+", "AB-", "AB+"], "receive": ["O-"]},
-        "O+": {"give": ["O+", "A+", "B+", "AB+"], "receive": ["O+", "O-"]},
-        "A-": {"give": ["A-", "A+", "AB-", "AB+"], "receive": ["A-", "O-"]},
-        "A+": {"give": ["A+", "AB+"], "receive": ["A+", "A-", "O+", "O-"]},
-        "B-": {"give": ["B-", "B+", "AB-", "AB+"], "receive": ["B-", "O-"]},
-        "B+": {"give": ["B+", "AB+"], "receive": ["B+", "B-", "O+", "O-"]},
-        "AB-": {"give": ["AB-", "AB+"], "receive": ["AB-", "A-", "B-", "O-"]},
-        "AB+": {"give": ["AB+"], "receive": ["O-", "O+", "A-", "A+", "B-", "B+", "AB-", "AB+"]}
-    }
 
-    if blood_type not in compatibility_chart:
+    compat = _COMPAT.get(blood_type)
+    if compat is None:
         raise HTTPException(status_code=400, detail="Invalid blood type entered.")
 
+    # Single lookups answer straight from the chart, keeping its list order;
+    # the masks are for batch checks
+    can_give_to, can_receive_from = compat
     return {
         "blood_type": blood_type,
-        "can_give_to": compatibility_chart[blood_type]["give"],
-        "can_receive_from": compatibility_chart[blood_type]["receive"]
+        "can_give_to": list(can_give_to),
+        "can_receive_from": list(can_receive_from)
     }
 
 @router.get("/emergency-first-aid", response_model=List[FirstAidGuide])
-def get_first_aid_guides():
-    return [
-        {
-            "condition": "Fainting",
-            "steps": [
-                "Lie the person down on their back.",
-                "Elevate their legs to restore blood flow to the brain.",
-                "Loosen tight clothing.",
-                "Check for breathing and pulse.",
-                "If they don't wake up within a minute, call emergency services."
-            ]
-        },
-        {
-            "condition": "Bleeding",
-            "steps": [
-                "Apply direct pressure to the wound with a clean cloth.",
-                "Keep the injured limb elevated if possible.",
-                "Do not remove the cloth if it soaks through, add more layers.",
-                "Seek medical attention if bleeding is severe or doesn't stop."
-            ]
-        },
-        {
-            "condition": "Burn",
-            "steps": [
-                "Cool the burn with cool (not cold) running water for 10-20 minutes.",
-                "Cover with a sterile, non-fluffy dressing or cling film.",
-                "Do not apply ice, butter, or creams immediately.",
-                "Seek medical help for severe burns or chemical burns."
-            ]
-        }
-    ]
+def get_first_aid_guides(request: Request):
+    return _static_response(request, _FIRST_AID_BYTES, _FIRST_AID_ETAG)
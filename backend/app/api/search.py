@@ -1,74 +1,131 @@
 
+import asyncio
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text, bindparam, Float, Integer, String
+from cachetools import TTLCache
 from app.database import get_db
-from app.schemas.request import BloodSearchRequest, SortPreference
-from app.schemas.response import BloodSearchResponse
+from app.schemas.request import BloodSearchRequest, SortPreference, DEFAULT_SEARCH_RADIUS_M
+from app.schemas.response import BloodBankResult, BloodSearchResponse
 
 router = APIRouter()
 
-@router.post("/search-blood", response_model=BloodSearchResponse)
-async def search_blood(req: BloodSearchRequest, db: Session = Depends(get_db)):
-    # Standard query to get nearby active centers
-    query = text("""
+RESULT_LIMIT = 5
+
+_URL_FMT = "https://www.google.com/maps/dir/?api=1&destination=%s,%s"
+
+# Short-lived cache of search rows; nearby map pans from the same ~1km cell share results.
+# One lock per key in flight so concurrent misses on a cell run the query once.
+SEARCH_CACHE_TTL = 30
+_SEARCH_CACHE = TTLCache(maxsize=10_000, ttl=SEARCH_CACHE_TTL)
+_SEARCH_LOCKS = {}
+
+_RADIUS_FILTER = """
+          AND ST_DWithin(bb.location, ST_SetSRID(ST_MakePoint(:lon, :lat), 4326)::geography, :radius_m)"""
+
+# Standard query to get nearby active centers
+_SEARCH_SQL = """
+    WITH nearby AS (
         SELECT 
-            bb.id as blood_bank_id,
+            bb.id::text as id,
             bb.name,
-            bb.latitude,
-            bb.longitude,
             bb.address,
-            bb.contact_number,
             ST_Distance(bb.location, ST_SetSRID(ST_MakePoint(:lon, :lat), 4326)::geography) / 1000 as distance_km,
-            (
-                SELECT jsonb_object_agg(blood_type, units_available)
-                FROM blood_inventory
-                WHERE blood_bank_id = bb.id
-            ) as full_inventory,
-            (
-                SELECT units_available 
-                FROM blood_inventory 
-                WHERE blood_bank_id = bb.id AND blood_type = :blood_type
-            ) as requested_units
+            COALESCE(inv.requested_units, 0) as units_available,
+            COALESCE(inv.full_inventory, '{}'::jsonb) as inventory,
+            bb.latitude,
+            bb.longitude,
+            bb.contact_number
         FROM blood_banks bb
-        WHERE bb.is_active = true
-          AND EXISTS (
-              SELECT 1 FROM blood_inventory 
-              WHERE blood_bank_id = bb.id 
-              AND blood_type = :blood_type 
-              AND units_available > 0
-          )
-    """)
-    
-    results = db.execute(query, {
-        "lat": req.latitude,
-        "lon": req.longitude,
-        "blood_type": req.blood_type
-    }).fetchall()
-
-    formatted_results = []
-    for row in results:
-        # Business logic for ETA calculation (simulated for MVP)
-        # In production, this would call Google Distance Matrix
-        eta = int(row.distance_km * 2.5) 
-        formatted_results.append({
-            "id": str(row.blood_bank_id),
-            "name": row.name,
-            "address": row.address,
-            "distance_km": round(row.distance_km, 2),
-            "eta_minutes": eta,
-            "units_available": row.requested_units or 0,
-            "inventory": row.full_inventory or {},
-            "latitude": row.latitude,
-            "longitude": row.longitude,
-            "contact_number": row.contact_number,
-            "google_maps_url": f"https://www.google.com/maps/dir/?api=1&destination={row.latitude},{row.longitude}"
-        })
+        LEFT JOIN LATERAL (
+            SELECT
+                jsonb_object_agg(blood_type, units_available) as full_inventory,
+                MAX(units_available) FILTER (WHERE blood_type = :blood_type) as requested_units
+            FROM blood_inventory
+            WHERE blood_bank_id = bb.id
+        ) inv ON TRUE
+        WHERE bb.is_active = true{RADIUS_FILTER}
+          AND inv.requested_units > 0
+        ORDER BY bb.location <-> ST_SetSRID(ST_MakePoint(:lon, :lat), 4326)::geography
+        LIMIT :limit
+    )
+    SELECT
+        id,
+        name,
+        address,
+        ROUND(distance_km::numeric, 2)::float8 as distance_km,
+        -- ETA is simulated for the MVP (in production, this would call Google Distance Matrix)
+        FLOOR(distance_km * 2.5)::int as eta_minutes,
+        units_available,
+        inventory,
+        latitude,
+        longitude,
+        contact_number
+    FROM nearby
+    ORDER BY nearby.distance_km
+"""
+
+_SEARCH_PARAMS = (
+    bindparam("lat", type_=Float),
+    bindparam("lon", type_=Float),
+    bindparam("blood_type", type_=String),
+    bindparam("limit", type_=Integer)
+)
+
+# Radius-bounded search; the GiST index prunes everything outside the radius
+_SEARCH_STMT = text(_SEARCH_SQL.replace("{RADIUS_FILTER}", _RADIUS_FILTER)).bindparams(
+    *_SEARCH_PARAMS, bindparam("radius_m", type_=Integer)
+)
+# Unbounded KNN fallback so remote users still get the nearest stocked centers
+_NEAREST_STMT = text(_SEARCH_SQL.replace("{RADIUS_FILTER}", "")).bindparams(*_SEARCH_PARAMS)
+
+@router.post("/search-blood", response_model=BloodSearchResponse)
+async def search_blood(req: BloodSearchRequest, db: AsyncSession = Depends(get_db)):
+    radius_m = req.radius_m or DEFAULT_SEARCH_RADIUS_M
+    # Query from the cell centre so a cached entry is right for every caller in the cell
+    lat = round(req.latitude, 2)
+    lon = round(req.longitude, 2)
+    params = {
+        "lat": lat,
+        "lon": lon,
+        "blood_type": req.blood_type,
+        "limit": RESULT_LIMIT
+    }
+
+    async def fetch_rows():
+        result = await db.execute(_SEARCH_STMT, {**params, "radius_m": radius_m})
+        rows = result.mappings().all()
+        if len(rows) >= RESULT_LIMIT:
+            return rows
+
+        # Too few inside the radius: KNN already stops after LIMIT, so one unbounded
+        # pass returns the nearest stocked centers wherever they are
+        result = await db.execute(_NEAREST_STMT, params)
+        return result.mappings().all()
+
+    cache_key = f"{lat}:{lon}:{req.blood_type}:{radius_m}"
+    results = _SEARCH_CACHE.get(cache_key)
+    if results is None:
+        lock = _SEARCH_LOCKS.setdefault(cache_key, asyncio.Lock())
+        try:
+            async with lock:
+                results = _SEARCH_CACHE.get(cache_key)
+                if results is None:
+                    results = await fetch_rows()
+                    _SEARCH_CACHE[cache_key] = results
+        finally:
+            if _SEARCH_LOCKS.get(cache_key) is lock:
+                del _SEARCH_LOCKS[cache_key]
+
+    formatted_results = [
+        BloodBankResult(**row, google_maps_url=_URL_FMT % (row["latitude"], row["longitude"]))
+        for row in results
+    ]
 
     # Apply sorting preference
     if req.sort_by == SortPreference.ETA:
-        formatted_results.sort(key=lambda x: x["eta_minutes"])
+        formatted_results.sort(key=lambda x: x.eta_minutes)
     else:
-        formatted_results.sort(key=lambda x: x["distance_km"])
+        formatted_results.sort(key=lambda x: x.distance_km)
 
-    return {"results": formatted_results[:5]}
+    return BloodSearchResponse(results=formatted_results[:RESULT_LIMIT])
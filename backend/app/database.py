@@ -20,22 +20,40 @@
 
 import os
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
 
 load_dotenv()
 
+def asyncpg_url(database_url):
+    """Derive the asyncpg URL from a psycopg2-style DATABASE_URL."""
+    url = make_url(database_url)
+    query = dict(url.query)
+    # libpq's sslmode values (require, verify-full, ...) map onto asyncpg's ssl argument
+    if "sslmode" in query:
+        query["ssl"] = query.pop("sslmode")
+    unsupported = sorted(set(query) - {"ssl"})
+    if unsupported:
+        raise RuntimeError(
+            f"DATABASE_URL options {unsupported} have no asyncpg equivalent; set ASYNC_DATABASE_URL explicitly"
+        )
+    return url.set(drivername="postgresql+asyncpg", query=query)
+
 DATABASE_URL = os.getenv("DATABASE_URL")
+# API requests go through asyncpg; the sync engine is kept for scripts like init_db
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or asyncpg_url(DATABASE_URL)
 
 engine = create_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = create_async_engine(ASYNC_DATABASE_URL)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
@@ -0,0 +1,20 @@
+
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Index, text
+from sqlalchemy.dialects.postgresql import UUID
+from app.database import Base
+
+class BloodInventory(Base):
+    __tablename__ = "blood_inventory"
+    __table_args__ = (
+        # Covering index for the per-bank inventory LATERAL join in search
+        Index(
+            "inv_bank_type_idx", "blood_bank_id", "blood_type",
+            postgresql_include=["units_available"]
+        ),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
+    blood_bank_id = Column(UUID(as_uuid=True), ForeignKey("blood_banks.id"), nullable=False)
+    blood_type = Column(String, nullable=False)
+    units_available = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    last_updated = Column(DateTime(timezone=True), server_default=text("now()"))
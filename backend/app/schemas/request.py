@@ -1,8 +1,11 @@
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from typing import Optional
 from enum import Enum
 
+DEFAULT_SEARCH_RADIUS_M = 50_000
+MAX_SEARCH_RADIUS_M = 800_000
+
 class SortPreference(str, Enum):
     DISTANCE = "distance"
     ETA = "eta"
@@ -12,6 +15,7 @@ class BloodSearchRequest(BaseModel):
     latitude: float
     longitude: float
     sort_by: Optional[SortPreference] = SortPreference.DISTANCE
+    radius_m: Optional[int] = Field(DEFAULT_SEARCH_RADIUS_M, gt=0, le=MAX_SEARCH_RADIUS_M)
 
 class UserLogin(BaseModel):
     email: EmailStr
@@ -1,5 +1,20 @@
-from pydantic import BaseModel
-from typing import Dict
+from pydantic import BaseModel, ConfigDict
+from typing import Dict, Optional
+
+class BloodBankResult(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    name: str
+    address: str
+    distance_km: float
+    eta_minutes: int
+    units_available: int
+    inventory: Dict[str, int]
+    latitude: float
+    longitude: float
+    contact_number: Optional[str] = None
+    google_maps_url: str
 
 class BloodSearchResponse(BaseModel):
-    results: list[dict]
+    results: list[BloodBankResult]
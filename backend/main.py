@@ -5,7 +5,7 @@ import os
 
 load_dotenv()
 
-from app.api import search, auth
+from app.api import search, auth, insights
 
 app = FastAPI(title="LifeLink AI Blood Bank API")
 
@@ -26,4 +26,13 @@ def health_check():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
+    # Token revocation and the auth/search caches are process-local, so stay on one
+    # worker unless UVICORN_WORKERS is raised deliberately (logout is then per worker)
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("UVICORN_WORKERS", "1"))
+    )
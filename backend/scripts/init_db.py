@@ -9,6 +9,7 @@ try:
     from app.database import engine, Base
     from app.models.user import User
     from app.models.blood_bank import BloodBank
+    from app.models.blood_inventory import BloodInventory
 except ImportError as e:
     print(f"Error importing modules: {e}")
     print(f"Current sys.path: {sys.path}")
@@ -31,5 +32,31 @@ def init_db():
     Base.metadata.create_all(bind=engine)
     print("Tables created successfully!")
 
+    with engine.connect() as connection:
+        print("Creating indexes...")
+        # GiST index lets the KNN `<->` ORDER BY in search walk rows in distance order.
+        # geoalchemy2 already creates it under this name; this only backfills older databases.
+        connection.execute(text(
+            "CREATE INDEX IF NOT EXISTS idx_blood_banks_location "
+            "ON blood_banks USING GIST (location)"
+        ))
+        # Covering index so the inventory LATERAL join is answered from the index alone
+        # (declared on BloodInventory too; this backfills databases created before it)
+        connection.execute(text(
+            "CREATE INDEX IF NOT EXISTS inv_bank_type_idx "
+            "ON blood_inventory (blood_bank_id, blood_type) INCLUDE (units_available)"
+        ))
+        # Unused since search joins inventory per bank; drop it where an earlier init created it
+        connection.execute(text("DROP INDEX IF EXISTS inv_available_idx"))
+        connection.commit()
+
+    # CONCURRENTLY can't run inside a transaction. Reuses SQLAlchemy's index name so
+    # this is a no-op on fresh databases and only backfills older ones.
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.execute(text(
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ix_users_email ON users (email)"
+        ))
+    print("Indexes created successfully!")
+
 if __name__ == "__main__":
     init_db()
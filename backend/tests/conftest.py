@@ -0,0 +1,4 @@
+import os
+
+# app.database builds its engines at import time; they never connect in tests
+os.environ.setdefault("DATABASE_URL", "postgresql+psycopg2://localhost/lifelink_test")
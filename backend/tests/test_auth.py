@@ -0,0 +1,134 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, update
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from app.api import auth
+from app.database import get_db
+from app.models.user import User
+from main import app
+
+
+@pytest.fixture
+def client(tmp_path):
+    db_path = tmp_path / "auth.db"
+    sync_engine = create_engine(f"sqlite:///{db_path}")
+    User.__table__.create(sync_engine)
+
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    session_factory = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_db():
+        async with session_factory() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    with TestClient(app) as test_client:
+        test_client.sync_engine = sync_engine
+        yield test_client
+    app.dependency_overrides.clear()
+    sync_engine.dispose()
+
+
+def _register(client, email="donor@example.com", password="s3cret-pass"):
+    return client.post("/api/auth/register", json={
+        "email": email,
+        "password": password,
+        "full_name": "Test Donor",
+        "role": "DONOR"
+    })
+
+
+def test_register_then_login(client):
+    response = _register(client)
+    assert response.status_code == 200
+    assert response.json()["role"] == "DONOR"
+
+    with client.sync_engine.connect() as connection:
+        stored = connection.execute(User.__table__.select()).one()
+    assert stored.hashed_password.startswith("$2")
+    assert stored.hashed_password != "s3cret-pass"
+
+    response = client.post("/api/auth/login", json={"email": "donor@example.com", "password": "s3cret-pass"})
+    assert response.status_code == 200
+    assert response.json()["access_token"]
+
+    response = client.post("/api/auth/login", json={"email": "donor@example.com", "password": "wrong-pass"})
+    assert response.status_code == 401
+
+
+def test_register_duplicate_email(client):
+    assert _register(client).status_code == 200
+    assert _register(client).status_code == 400
+
+
+def test_login_accepts_passwords_longer_than_bcrypt_limit(client):
+    password = "x" * 100
+    assert _register(client, password=password).status_code == 200
+    response = client.post("/api/auth/login", json={"email": "donor@example.com", "password": password})
+    assert response.status_code == 200
+
+
+def test_login_upgrades_legacy_plaintext_password(client):
+    assert _register(client).status_code == 200
+    with client.sync_engine.begin() as connection:
+        connection.execute(update(User.__table__).values(hashed_password="legacy-pass"))
+
+    response = client.post("/api/auth/login", json={"email": "donor@example.com", "password": "legacy-pass"})
+    assert response.status_code == 200
+
+    with client.sync_engine.connect() as connection:
+        stored = connection.execute(User.__table__.select()).one()
+    assert stored.hashed_password.startswith("$2")
+
+
+def _login(client, password="s3cret-pass"):
+    response = client.post("/api/auth/login", json={"email": "donor@example.com", "password": password})
+    assert response.status_code == 200
+    return response.json()["access_token"]
+
+
+def test_logout_revokes_token(client):
+    assert _register(client).status_code == 200
+    token = _login(client)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    assert client.post("/api/auth/logout", headers=headers).status_code == 200
+    assert client.post("/api/auth/logout", headers=headers).status_code == 401
+
+    new_token = _login(client)
+    assert new_token != token
+    assert client.post("/api/auth/logout", headers={"Authorization": f"Bearer {new_token}"}).status_code == 200
+
+
+def test_logout_only_revokes_its_own_session(client):
+    assert _register(client).status_code == 200
+    phone, laptop = _login(client), _login(client)
+    assert phone != laptop
+
+    assert client.post("/api/auth/logout", headers={"Authorization": f"Bearer {phone}"}).status_code == 200
+    assert client.post("/api/auth/logout", headers={"Authorization": f"Bearer {laptop}"}).status_code == 200
+
+
+def test_login_unknown_email_still_runs_bcrypt(client, monkeypatch):
+    checked = []
+    real_check = auth._check_password
+
+    def recording_check(password, hashed_password):
+        checked.append(hashed_password)
+        return real_check(password, hashed_password)
+
+    monkeypatch.setattr(auth, "_check_password", recording_check)
+
+    response = client.post("/api/auth/login", json={"email": "nobody@example.com", "password": "s3cret-pass"})
+    assert response.status_code == 401
+    assert checked == [auth._DUMMY_HASH]
+
+
+def test_login_with_malformed_stored_hash_is_rejected(client):
+    assert _register(client).status_code == 200
+    with client.sync_engine.begin() as connection:
+        connection.execute(update(User.__table__).values(hashed_password="$2b$garbage"))
+
+    response = client.post("/api/auth/login", json={"email": "donor@example.com", "password": "s3cret-pass"})
+    assert response.status_code == 401
@@ -0,0 +1,18 @@
+import pytest
+
+from app.database import asyncpg_url
+
+
+def test_swaps_driver_and_keeps_credentials():
+    url = asyncpg_url("postgresql+psycopg2://user:pw@db:5432/lifelink")
+    assert url.render_as_string(hide_password=False) == "postgresql+asyncpg://user:pw@db:5432/lifelink"
+
+
+def test_translates_sslmode_to_ssl():
+    url = asyncpg_url("postgresql://user:pw@db/lifelink?sslmode=require")
+    assert dict(url.query) == {"ssl": "require"}
+
+
+def test_rejects_options_asyncpg_does_not_understand():
+    with pytest.raises(RuntimeError, match="ASYNC_DATABASE_URL"):
+        asyncpg_url("postgresql://user:pw@db/lifelink?connect_timeout=10")
@@ -0,0 +1,106 @@
+import heapq
+import math
+import random
+
+import pytest
+
+from algorithms.dijkstra import calculate_dijkstra
+
+
+def reference_dijkstra(graph, start_node, end_node):
+    # The original pure-Python heapq implementation
+    distances = {node: float('infinity') for node in graph}
+    distances[start_node] = 0
+    pq = [(0, start_node)]
+    previous_nodes = {node: None for node in graph}
+
+    while pq:
+        current_distance, current_node = heapq.heappop(pq)
+
+        if current_node == end_node:
+            path = []
+            while current_node is not None:
+                path.append(current_node)
+                current_node = previous_nodes[current_node]
+            return path[::-1], distances[end_node]
+
+        if current_distance > distances[current_node]:
+            continue
+
+        for neighbor, weight in graph[current_node].items():
+            distance = current_distance + weight
+            if distance < distances[neighbor]:
+                distances[neighbor] = distance
+                previous_nodes[neighbor] = current_node
+                heapq.heappush(pq, (distance, neighbor))
+
+    return None, float('infinity')
+
+
+def _random_graph(rng, n, edges):
+    graph = {i: {} for i in range(n)}
+    for _ in range(edges):
+        a, b = rng.randrange(n), rng.randrange(n)
+        graph[a][b] = rng.choice([0.0, rng.random() * 10, float(rng.randint(1, 5))])
+    return graph
+
+
+def test_matches_reference_on_random_graphs():
+    rng = random.Random(1234)
+    for _ in range(300):
+        n = rng.randint(1, 50)
+        graph = _random_graph(rng, n, rng.randint(0, n * 5))
+        start, end = rng.randrange(n), rng.randrange(n)
+
+        path, distance = calculate_dijkstra(graph, start, end)
+        expected_path, expected_distance = reference_dijkstra(graph, start, end)
+
+        if expected_path is None:
+            assert path is None
+            assert distance == math.inf
+            continue
+        assert distance == pytest.approx(expected_distance)
+        assert path[0] == start and path[-1] == end
+        assert sum(graph[a][b] for a, b in zip(path, path[1:])) == pytest.approx(distance)
+
+
+def test_string_nodes_and_same_start_end():
+    graph = {"A": {"B": 1, "C": 4}, "B": {"C": 2, "D": 5}, "C": {"D": 1}, "D": {}}
+    assert calculate_dijkstra(graph, "A", "D") == (["A", "B", "C", "D"], 4.0)
+    assert calculate_dijkstra(graph, "A", "A") == (["A"], 0.0)
+    assert calculate_dijkstra(graph, "D", "A") == (None, math.inf)
+
+
+def test_unknown_nodes_are_unreachable():
+    graph = {"A": {"B": 1}, "B": {}}
+    assert calculate_dijkstra(graph, "A", "Z") == (None, math.inf)
+
+
+@pytest.mark.parametrize("weight", [-1.0, float("nan")])
+def test_rejects_negative_and_nan_weights(weight):
+    graph = {"A": {"B": 1.0}, "B": {"A": weight}}
+    with pytest.raises(ValueError):
+        calculate_dijkstra(graph, "A", "B")
+
+
+def test_csr_cache_is_bounded():
+    from algorithms import dijkstra
+
+    for _ in range(dijkstra.CSR_CACHE_SIZE * 3):
+        calculate_dijkstra({"A": {"B": 1.0}, "B": {}}, "A", "B")
+    assert len(dijkstra._CSR_CACHE) <= dijkstra.CSR_CACHE_SIZE
+
+
+def test_mutated_graph_needs_rebuild_or_invalidate():
+    from algorithms.dijkstra import invalidate_graph
+
+    graph = {"A": {"B": 2.0}, "B": {"C": 2.0}, "C": {}, "D": {}}
+    assert calculate_dijkstra(graph, "A", "C") == (["A", "B", "C"], 4.0)
+
+    graph["A"]["D"] = 0.5
+    graph["D"]["C"] = 0.5
+    assert calculate_dijkstra(graph, "A", "C", rebuild=True) == (["A", "D", "C"], 1.0)
+
+    graph["A"]["D"] = 5.0
+    invalidate_graph(graph)
+    assert calculate_dijkstra(graph, "A", "C") == (["A", "B", "C"], 4.0)
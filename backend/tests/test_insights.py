@@ -0,0 +1,151 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import insights
+from main import app
+
+# Bodies as served before the endpoints switched to pre-serialized bytes
+_IRON_ABSORPTION = {
+    "title": "Tips for Improving Iron Absorption",
+    "content": [
+        "Consume Vitamin C rich foods (citrus fruits, bell peppers) with iron-rich meals.",
+        "Avoid drinking tea or coffee with meals as tannins can inhibit iron absorption.",
+        "Cook in cast iron skillets to increase iron content in food.",
+        "Include lean meats, poultry, and fish in your diet as they contain heme iron which is easily absorbed.",
+        "Soak beans and grains before cooking to reduce phytates which can block iron absorption."
+    ],
+    "source": "General Health Guidelines"
+}
+
+_DONOR_RECOVERY = {
+    "title": "Post-Donation Recovery Advice",
+    "content": [
+        "Drink plenty of fluids for the next 24-48 hours.",
+        "Avoid strenuous physical activity or heavy lifting for the rest of the day.",
+        "Keep the bandage on for the next 5 hours.",
+        "If you feel lightheaded, lie down with your feet up until the feeling passes.",
+        "Eat a healthy meal rich in iron and protein."
+    ],
+    "source": "Blood Donation Center Protocols"
+}
+
+_FIRST_AID = [
+    {
+        "condition": "Fainting",
+        "steps": [
+            "Lie the person down on their back.",
+            "Elevate their legs to restore blood flow to the brain.",
+            "Loosen tight clothing.",
+            "Check for breathing and pulse.",
+            "If they don't wake up within a minute, call emergency services."
+        ]
+    },
+    {
+        "condition": "Bleeding",
+        "steps": [
+            "Apply direct pressure to the wound with a clean cloth.",
+            "Keep the injured limb elevated if possible.",
+            "Do not remove the cloth if it soaks through, add more layers.",
+            "Seek medical attention if bleeding is severe or doesn't stop."
+        ]
+    },
+    {
+        "condition": "Burn",
+        "steps": [
+            "Cool the burn with cool (not cold) running water for 10-20 minutes.",
+            "Cover with a sterile, non-fluffy dressing or cling film.",
+            "Do not apply ice, butter, or creams immediately.",
+            "Seek medical help for severe burns or chemical burns."
+        ]
+    }
+]
+
+_STATIC_ENDPOINTS = [
+    ("/api/insights/iron-absorption", _IRON_ABSORPTION),
+    ("/api/insights/donor-recovery", _DONOR_RECOVERY),
+    ("/api/insights/emergency-first-aid", _FIRST_AID),
+]
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.mark.parametrize("path, expected", _STATIC_ENDPOINTS)
+def test_static_insight_served_with_cache_headers(client, path, expected):
+    response = client.get(path)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.headers["cache-control"] == "public, max-age=3600, immutable"
+    assert response.headers["etag"].startswith('"')
+    assert response.json() == expected
+
+
+@pytest.mark.parametrize("path", [path for path, _ in _STATIC_ENDPOINTS])
+@pytest.mark.parametrize("if_none_match", [
+    "{etag}",
+    "W/{etag}",
+    '"stale", {etag}',
+    '"stale",W/{etag}',
+    "*",
+])
+def test_static_insight_not_modified(client, path, if_none_match):
+    etag = client.get(path).headers["etag"]
+
+    response = client.get(path, headers={"If-None-Match": if_none_match.format(etag=etag)})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    assert response.headers["cache-control"] == "public, max-age=3600, immutable"
+
+
+@pytest.mark.parametrize("path, expected", _STATIC_ENDPOINTS)
+@pytest.mark.parametrize("if_none_match", ['"stale"', 'W/"stale"', '"stale", "older"'])
+def test_static_insight_stale_tag_gets_full_body(client, path, expected, if_none_match):
+    response = client.get(path, headers={"If-None-Match": if_none_match})
+    assert response.status_code == 200
+    assert response.json() == expected
+
+
+def test_static_insight_etags_differ_per_payload(client):
+    etags = {client.get(path).headers["etag"] for path, _ in _STATIC_ENDPOINTS}
+    assert len(etags) == len(_STATIC_ENDPOINTS)
+
+
+# Chart as served before the bitmask table was added; list order is part of the response
+_COMPATIBILITY = {
+    "O-": (["O-", "O+", "A-", "A+", "B-", "B+", "AB-", "AB+"], ["O-"]),
+    "O+": (["O+", "A+", "B+", "AB+"], ["O+", "O-"]),
+    "A-": (["A-", "A+", "AB-", "AB+"], ["A-", "O-"]),
+    "A+": (["A+", "AB+"], ["A+", "A-", "O+", "O-"]),
+    "B-": (["B-", "B+", "AB-", "AB+"], ["B-", "O-"]),
+    "B+": (["B+", "AB+"], ["B+", "B-", "O+", "O-"]),
+    "AB-": (["AB-", "AB+"], ["AB-", "A-", "B-", "O-"]),
+    "AB+": (["AB+"], ["O-", "O+", "A-", "A+", "B-", "B+", "AB-", "AB+"]),
+}
+
+
+@pytest.mark.parametrize("blood_type", _COMPATIBILITY)
+def test_compatibility_matches_original_chart(client, blood_type):
+    can_give_to, can_receive_from = _COMPATIBILITY[blood_type]
+    response = client.post("/api/insights/compatibility", json={"blood_type": blood_type.lower()})
+    assert response.status_code == 200
+    assert response.json() == {
+        "blood_type": blood_type,
+        "can_give_to": can_give_to,
+        "can_receive_from": can_receive_from
+    }
+
+
+def test_compatibility_masks_agree_with_chart():
+    for blood_type, (can_give_to, can_receive_from) in _COMPATIBILITY.items():
+        idx = insights._IDX[blood_type]
+        assert {t for t in insights._TYPES if insights._GIVE[idx] >> insights._IDX[t] & 1} == set(can_give_to)
+        assert {t for t in insights._TYPES if insights._RECV[idx] >> insights._IDX[t] & 1} == set(can_receive_from)
+
+
+def test_compatibility_rejects_unknown_type(client):
+    response = client.post("/api/insights/compatibility", json={"blood_type": "C+"})
+    assert response.status_code == 400
@@ -0,0 +1,125 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import search
+from app.database import get_db
+from app.schemas.request import MAX_SEARCH_RADIUS_M
+from main import app
+
+
+class _Result:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return self._rows
+
+
+class _RecordingSession:
+    """Stands in for AsyncSession: records each statement and returns `rows` for it."""
+
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.calls = []
+
+    async def execute(self, statement, params):
+        self.calls.append((statement, params))
+        return _Result(self.rows)
+
+
+def _row(n, distance_km, eta_minutes):
+    # Same columns, in the same order, as _SEARCH_SQL's outer SELECT
+    return {
+        "id": f"00000000-0000-0000-0000-00000000000{n}",
+        "name": f"Center {n}",
+        "address": f"{n} Hospital Road",
+        "distance_km": distance_km,
+        "eta_minutes": eta_minutes,
+        "units_available": n,
+        "inventory": {"O-": n, "A+": 10},
+        "latitude": 12.9 + n / 100,
+        "longitude": 77.5 + n / 100,
+        "contact_number": None if n == 3 else f"+91-80-000{n}",
+    }
+
+
+# Database order is by distance; ETA order deliberately differs (e.g. traffic)
+_ROWS = [_row(1, 1.25, 9), _row(2, 2.5, 4), _row(3, 4.75, 12), _row(4, 6.0, 7), _row(5, 8.5, 15)]
+
+
+def _use_session(recording):
+    async def override_get_db():
+        yield recording
+
+    search._SEARCH_CACHE.clear()
+    app.dependency_overrides[get_db] = override_get_db
+    yield recording
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def session():
+    yield from _use_session(_RecordingSession())
+
+
+@pytest.fixture
+def stocked_session():
+    yield from _use_session(_RecordingSession(_ROWS))
+
+
+def _search(radius_m=None, **kwargs):
+    body = {"blood_type": "O-", "latitude": 12.97, "longitude": 77.59, **kwargs}
+    if radius_m is not None:
+        body["radius_m"] = radius_m
+    with TestClient(app) as client:
+        return client.post("/api/search-blood", json=body)
+
+
+@pytest.mark.parametrize("radius_m", [0, -5, MAX_SEARCH_RADIUS_M + 1, 10**12])
+def test_rejects_out_of_range_radius(session, radius_m):
+    assert _search(radius_m).status_code == 422
+    assert session.calls == []
+
+
+def test_falls_back_to_unbounded_knn_once(session):
+    response = _search(radius_m=100_000)
+    assert response.status_code == 200
+    assert response.json() == {"results": []}
+
+    assert [stmt for stmt, _ in session.calls] == [search._SEARCH_STMT, search._NEAREST_STMT]
+    assert session.calls[0][1]["radius_m"] == 100_000
+    assert "radius_m" not in session.calls[1][1]
+
+
+def test_same_cell_shares_one_query_at_cell_centre(session):
+    assert _search(latitude=12.9712, longitude=77.5938).status_code == 200
+    assert _search(latitude=12.9741, longitude=77.5891).status_code == 200
+
+    assert len(session.calls) == 2  # bounded + fallback for the first request only
+    assert {(params["lat"], params["lon"]) for _, params in session.calls} == {(12.97, 77.59)}
+
+
+def _expected(row):
+    return {
+        **row,
+        "google_maps_url": f"https://www.google.com/maps/dir/?api=1&destination={row['latitude']},{row['longitude']}",
+    }
+
+
+def test_returns_rows_sorted_by_distance(stocked_session):
+    response = _search(sort_by="distance")
+    assert response.status_code == 200
+    assert response.json() == {"results": [_expected(row) for row in _ROWS]}
+    # A full bounded page needs no fallback
+    assert [stmt for stmt, _ in stocked_session.calls] == [search._SEARCH_STMT]
+
+
+def test_returns_rows_sorted_by_eta(stocked_session):
+    response = _search(sort_by="eta")
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["name"] for r in results] == ["Center 2", "Center 4", "Center 1", "Center 3", "Center 5"]
+    assert results == [_expected(row) for row in sorted(_ROWS, key=lambda r: r["eta_minutes"])]